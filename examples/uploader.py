@@ -5,6 +5,7 @@ Mizuchi Uploadr CLI Client
 A command-line tool for uploading files to Mizuchi Uploadr with support for:
 - Simple uploads for small files
 - Parallel multipart uploads for large files
+- Resuming interrupted multipart uploads
 - JWT authentication
 - Progress display
 
@@ -28,62 +29,93 @@ Examples:
 """
 
 import argparse
+import base64
+import hashlib
+import io
+import json
+import mmap
 import os
+import random
+import re
+import socket
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Lock
-from typing import List, Optional, Tuple
-
-try:
-    import defusedxml.ElementTree as ET
-except ImportError:
-    # Fallback to standard library with a warning
-    import xml.etree.ElementTree as ET
-    print("Warning: 'defusedxml' not installed. Using standard XML parser.", file=sys.stderr)
-    print("Install with: pip install defusedxml", file=sys.stderr)
+from threading import Event, Thread
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 try:
     import requests
+    import urllib3
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Error: 'requests' library is required.")
     print("Install with: pip install requests")
     sys.exit(1)
 
+try:
+    import httpx
+except ImportError:
+    httpx = None  # Optional: only needed for --http2
+
 
 # Default configuration
 DEFAULT_ENDPOINT = "http://localhost:8080"
 DEFAULT_CHUNK_SIZE = 10 * 1024 * 1024  # 10MB
 DEFAULT_MULTIPART_THRESHOLD = 50 * 1024 * 1024  # 50MB
 DEFAULT_PARALLEL = 4
+RENDER_INTERVAL = 0.25  # seconds between progress bar redraws
+SEND_BLOCK_SIZE = 1024 * 1024  # 1MB body reads per send (urllib3 default: 16KB)
+MANIFEST_SUFFIX = '.mizuchi-resume.json'
+RETRY_ATTEMPTS = 5
+RETRY_BACKOFF = 0.5  # backoff factor: sleep RETRY_BACKOFF * 2 ** (retry - 1)
+RETRY_JITTER = 0.5  # up to this many extra random seconds per retry
+RETRY_STATUSES = frozenset([408, 429, 500, 502, 503, 504])
+# Methods safe to replay once the request may have reached the server.
+# POST (initiate/complete multipart) is not: a replayed initiate leaves an
+# orphan upload and a replayed complete gets 404 after the first succeeded,
+# so POST is only retried when the connection could not be established.
+RETRY_METHODS = frozenset(['PUT', 'DELETE'])
+MANIFEST_SAVE_INTERVAL = 1.0  # seconds between resume manifest writes
+MANIFEST_SAVE_PARTS = 16  # or after this many newly completed parts
+
+# urllib3 2.x adds the `blocksize` pool option and Retry(backoff_jitter=...)
+_URLLIB3_V2 = int(urllib3.__version__.split('.')[0]) >= 2
+
+
+# S3 responses are well-formed and we only need the upload ID, so a regex
+# over the raw body replaces building a full XML tree
+_UPLOAD_ID_RE = re.compile(rb'<UploadId(?:\s[^>]*)?>([^<]+)</UploadId>')
+
+_SIZE_RE = re.compile(r'^\s*([\d.]+)\s*([KMGT]?B?)\s*$', re.IGNORECASE)
+_SIZE_MULTIPLIERS = {
+    '': 1,
+    'B': 1,
+    'K': 1024,
+    'KB': 1024,
+    'M': 1024 ** 2,
+    'MB': 1024 ** 2,
+    'G': 1024 ** 3,
+    'GB': 1024 ** 3,
+    'T': 1024 ** 4,
+    'TB': 1024 ** 4,
+}
 
 
 def parse_size(size_str: str) -> int:
     """Parse human-readable size string to bytes."""
-    size_str = size_str.strip().upper()
-    units = {
-        'B': 1,
-        'K': 1024,
-        'KB': 1024,
-        'M': 1024 * 1024,
-        'MB': 1024 * 1024,
-        'G': 1024 * 1024 * 1024,
-        'GB': 1024 * 1024 * 1024,
-    }
-
-    for unit, multiplier in sorted(units.items(), key=lambda x: -len(x[0])):
-        if size_str.endswith(unit):
-            try:
-                return int(float(size_str[:-len(unit)]) * multiplier)
-            except ValueError:
-                pass
-
-    try:
-        return int(size_str)
-    except ValueError:
-        raise ValueError(f"Invalid size format: {size_str}")
+    match = _SIZE_RE.match(size_str)
+    if match:
+        try:
+            return int(float(match.group(1)) * _SIZE_MULTIPLIERS[match.group(2).upper()])
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid size format: {size_str.strip()}")
 
 
 def format_size(size: int) -> str:
@@ -105,37 +137,286 @@ def format_time(seconds: float) -> str:
         return f"{int(seconds // 3600)}h {int((seconds % 3600) // 60)}m"
 
 
+# urllib3's defaults already disable Nagle (TCP_NODELAY); keep them.
+# SO_KEEPALIVE only lets the kernel notice a peer that vanished while a
+# connection sat idle for a long time (probes start after tcp_keepalive_time,
+# ~2h by default). SO_SNDBUF is deliberately not set: on Linux a fixed value
+# disables send-buffer autotuning, which grows well past what an
+# unprivileged setsockopt can request.
+_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+def _retry_delay(retries: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to sleep before retry number `retries`, as urllib3 computes it."""
+    if retry_after is not None and retry_after.isdigit():
+        return float(retry_after)
+    backoff = RETRY_BACKOFF * 2 ** (retries - 1) if retries > 1 else 0
+    return backoff + random.uniform(0, RETRY_JITTER)
+
+
+class _TunedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets are tuned for bulk uploads."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = _SOCKET_OPTIONS
+        # Stream request bodies in large blocks: far fewer read()/send()
+        # round trips through Python per part. urllib3 1.x has no such option.
+        if _URLLIB3_V2:
+            kwargs['blocksize'] = SEND_BLOCK_SIZE
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _Http2Session:
+    """Minimal requests.Session stand-in that sends requests over HTTP/2.
+
+    Concurrent part uploads are multiplexed as streams on one httpx
+    connection. If the server only speaks HTTP/1.1, httpx falls back to it
+    and opens up to `max_connections` connections instead.
+
+    Behaves like the requests session: same socket options, bodies read in
+    SEND_BLOCK_SIZE blocks, and the same retry policy. The transport retries
+    connect errors for any method; read errors and RETRY_STATUSES are
+    retried here, for RETRY_METHODS only.
+    """
+
+    def __init__(self, max_connections: int):
+        # Raises ImportError if the optional 'h2' package is missing
+        self.client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=RETRY_ATTEMPTS,
+                socket_options=_SOCKET_OPTIONS,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            ),
+            timeout=None,
+        )
+
+    def put(self, url: str, data=None, headers: Optional[dict] = None):
+        return self._request('PUT', url, data, headers)
+
+    def post(self, url: str, data=None, headers: Optional[dict] = None):
+        return self._request('POST', url, data, headers)
+
+    def delete(self, url: str, headers: Optional[dict] = None):
+        return self._request('DELETE', url, None, headers)
+
+    def _request(self, method: str, url: str, data, headers: Optional[dict]):
+        retryable = method in RETRY_METHODS
+        # File-like bodies are rewound before every attempt
+        start = data.tell() if hasattr(data, 'seek') else None
+        retries = 0
+
+        while True:
+            content = data
+            if start is not None:
+                data.seek(start)
+                content = iter(lambda: data.read(SEND_BLOCK_SIZE), b'')
+
+            try:
+                response = self.client.request(method, url, content=content, headers=headers)
+            except httpx.TransportError:
+                if not retryable or retries >= RETRY_ATTEMPTS:
+                    raise
+                retry_after = None
+            else:
+                if not retryable or retries >= RETRY_ATTEMPTS \
+                        or response.status_code not in RETRY_STATUSES:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+
+            retries += 1
+            time.sleep(_retry_delay(retries, retry_after))
+
+
+class _Slice(io.RawIOBase):
+    """Read-only, seekable view of the byte range [start, end) of a mmap."""
+
+    def __init__(self, mm: mmap.mmap, start: int, end: int):
+        self.mm = mm
+        self.start = start
+        self.end = end
+        self.pos = start
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos - self.start
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            base = self.start
+        elif whence == io.SEEK_CUR:
+            base = self.pos
+        else:
+            base = self.end
+        self.pos = min(max(base + offset, self.start), self.end)
+        return self.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        # Slice the mapping directly: one block-sized copy per call, rather
+        # than RawIOBase's readinto() into a bytearray and a second copy out
+        remaining = self.end - self.pos
+        n = remaining if size is None or size < 0 else min(size, remaining)
+        data = self.mm[self.pos:self.pos + n]
+        self.pos += n
+        return data
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self.end - self.pos)
+        with memoryview(self.mm)[self.pos:self.pos + n] as view:
+            b[:n] = view
+        self.pos += n
+        return n
+
+
 @dataclass
 class UploadProgress:
-    """Track upload progress across parallel uploads."""
+    """Track upload progress across parallel uploads.
+
+    Workers only account bytes with add(); a background thread redraws the
+    bar every RENDER_INTERVAL seconds until close() is called. If `position`
+    is given, it is polled for the uploaded byte count instead.
+
+    add() appends to a deque, which is atomic under the GIL, and only the
+    render thread folds those sizes into `uploaded`, so workers never
+    contend on a lock.
+    """
     total_size: int
     uploaded: int = 0
-    lock: Lock = None
     start_time: float = None
+    position: Optional[Callable[[], int]] = None
+
+    BAR_WIDTH = 40
 
     def __post_init__(self):
-        self.lock = Lock()
+        self._pending = deque()
         self.start_time = time.time()
+        # Each frame slices these instead of rebuilding the bar characters
+        self._full_bar = '█' * self.BAR_WIDTH
+        self._empty_bar = '░' * self.BAR_WIDTH
+        self._out = getattr(sys.stdout, 'buffer', None)
+        self._encoding = sys.stdout.encoding or 'utf-8'
+        self._stop = Event()
+        self._thread = Thread(target=self._render_loop, daemon=True)
+        self._thread.start()
 
     def add(self, size: int):
-        with self.lock:
-            self.uploaded += size
+        self._pending.append(size)
+
+    def close(self):
+        """Stop the render thread and draw the final state."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self.display()
+
+    def _render_loop(self):
+        while not self._stop.wait(RENDER_INTERVAL):
+            self.display()
 
     def display(self):
-        with self.lock:
-            percentage = (self.uploaded / self.total_size) * 100 if self.total_size > 0 else 0
-            elapsed = time.time() - self.start_time
-            speed = self.uploaded / elapsed if elapsed > 0 else 0
-            remaining = (self.total_size - self.uploaded) / speed if speed > 0 else 0
-
-            bar_width = 40
-            filled = int(bar_width * percentage / 100)
-            bar = '█' * filled + '░' * (bar_width - filled)
-
-            sys.stdout.write(f"\r[{bar}] {percentage:5.1f}% | "
-                           f"{format_size(self.uploaded)}/{format_size(self.total_size)} | "
-                           f"{format_size(speed)}/s | ETA: {format_time(remaining)}  ")
+        """Draw the current state; only called from one thread at a time."""
+        if self.position is not None:
+            self.uploaded = self.position()
+        pending = self._pending
+        while pending:
+            self.uploaded += pending.popleft()
+
+        percentage = (self.uploaded / self.total_size) * 100 if self.total_size > 0 else 0
+        elapsed = time.time() - self.start_time
+        speed = self.uploaded / elapsed if elapsed > 0 else 0
+        remaining = (self.total_size - self.uploaded) / speed if speed > 0 else 0
+
+        filled = int(self.BAR_WIDTH * percentage / 100)
+        bar = self._full_bar[:filled] + self._empty_bar[filled:]
+
+        line = (f"\r[{bar}] {percentage:5.1f}% | "
+                f"{format_size(self.uploaded)}/{format_size(self.total_size)} | "
+                f"{format_size(speed)}/s | ETA: {format_time(remaining)}  ")
+
+        if self._out is None:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        else:
+            # Write the frame to the binary buffer in one call; flush the
+            # text layer first so earlier print() output stays in order
             sys.stdout.flush()
+            self._out.write(line.encode(self._encoding, 'replace'))
+            self._out.flush()
+
+
+class _ResumeManifest:
+    """On-disk record of a multipart upload's completed parts, for --resume.
+
+    Stored next to the source file, one per endpoint and destination. The
+    manifest is only reused if the file (size and mtime) and chunk size are
+    unchanged. Writes are batched to at most one per MANIFEST_SAVE_INTERVAL
+    seconds or MANIFEST_SAVE_PARTS new parts.
+    """
+
+    def __init__(self, path: Path, identity: dict):
+        self.path = path
+        self.identity = identity
+        self.upload_id: Optional[str] = None
+        # (identity, upload_id) of a manifest left by a different upload
+        self.stale: Optional[Tuple[dict, str]] = None
+        self._saved_parts = 0
+        self._saved_at = time.monotonic()
+
+    def load(self) -> List[Tuple[int, str]]:
+        """Load a matching manifest, setting upload_id; return its parts."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data['identity'] != self.identity:
+                if isinstance(data['identity'], dict) and isinstance(data['upload_id'], str):
+                    self.stale = (data['identity'], data['upload_id'])
+                return []
+            self.upload_id = data['upload_id']
+            parts = [(int(part_num), etag) for part_num, etag in data['parts']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+        self._saved_parts = len(parts)
+        return parts
+
+    def save(self, parts: List[Tuple[int, str]], force: bool = False):
+        """Persist the completed parts, unless the last save was too recent."""
+        now = time.monotonic()
+        if not force and len(parts) - self._saved_parts < MANIFEST_SAVE_PARTS \
+                and now - self._saved_at < MANIFEST_SAVE_INTERVAL:
+            return
+
+        # Write to a temp file, fsync, then rename so a crash mid-write
+        # never leaves a truncated manifest behind
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'identity': self.identity,
+                'upload_id': self.upload_id,
+                'parts': parts,
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        self._saved_parts = len(parts)
+        self._saved_at = now
+
+    def delete(self):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
 
 
 class MizuchiUploader:
@@ -149,6 +430,8 @@ class MizuchiUploader:
         multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
         parallel: int = DEFAULT_PARALLEL,
         verbose: bool = False,
+        http2: bool = False,
+        resume: bool = False,
     ):
         self.endpoint = endpoint.rstrip('/')
         self.token = token
@@ -156,21 +439,87 @@ class MizuchiUploader:
         self.multipart_threshold = multipart_threshold
         self.parallel = parallel
         self.verbose = verbose
-        self.session = requests.Session()
+        self.resume = resume
+
+        # The connection pool has one slot per worker and blocks when full,
+        # so fewer than one worker would hang on the first request
+        if self.parallel < 1:
+            print(f"Warning: Parallel uploads increased to 1 (minimum)")
+            self.parallel = 1
+
+        self.session = self._create_session(http2)
+        # Set when a multipart upload fails so queued part workers bail out
+        self._cancel = Event()
+        # Set when the server reports the multipart upload ID as unknown
+        self._upload_missing = Event()
+        # Resume manifest of the multipart upload in progress (--resume only)
+        self._manifest: Optional[_ResumeManifest] = None
+
+        # Request headers are the same for every call, so build them once
+        self._base_headers = {
+            'User-Agent': 'mizuchi-uploader/1.0',
+        }
+        if token:
+            self._base_headers['Authorization'] = f'Bearer {token}'
 
         # Ensure chunk size is at least 5MB (S3 minimum)
         if self.chunk_size < 5 * 1024 * 1024:
             print(f"Warning: Chunk size increased to 5MB (S3 minimum)")
             self.chunk_size = 5 * 1024 * 1024
 
-    def _get_headers(self) -> dict:
-        """Get request headers including auth if configured."""
-        headers = {
-            'User-Agent': 'mizuchi-uploader/1.0',
-        }
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
-        return headers
+        # Every part but the last is exactly chunk_size bytes
+        self._chunk_content_length = str(self.chunk_size)
+
+    def _create_session(self, http2: bool):
+        """Create the HTTP session shared by all requests of this uploader."""
+        if http2:
+            if not self.endpoint.startswith('https://'):
+                # httpx has no h2c (cleartext HTTP/2) support
+                print("Warning: --http2 needs an https:// endpoint, using HTTP/1.1")
+            elif httpx is None:
+                print("Warning: 'httpx' not installed, falling back to HTTP/1.1")
+                print("Install with: pip install 'httpx[http2]'")
+            else:
+                try:
+                    return _Http2Session(self.parallel)
+                except ImportError:
+                    print("Warning: 'h2' not installed, falling back to HTTP/1.1")
+                    print("Install with: pip install 'httpx[http2]'")
+
+        session = requests.Session()
+
+        # Retry transient failures of a single request with exponential
+        # backoff, rather than failing the whole multipart upload. Read errors
+        # and retryable statuses are only replayed for RETRY_METHODS; urllib3
+        # retries connect errors for every method. Jitter spreads out retries
+        # from parallel workers.
+        retry_options = {}
+        if _URLLIB3_V2:
+            retry_options['backoff_jitter'] = RETRY_JITTER
+        retry = Retry(
+            total=RETRY_ATTEMPTS,
+            connect=RETRY_ATTEMPTS,
+            read=RETRY_ATTEMPTS,
+            status=RETRY_ATTEMPTS,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            **retry_options,
+        )
+
+        # Size the connection pool to the worker count so every parallel part
+        # upload keeps a warm keep-alive connection instead of re-handshaking.
+        adapter = _TunedAdapter(
+            pool_connections=self.parallel,
+            pool_maxsize=self.parallel,
+            pool_block=True,
+            max_retries=retry,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
 
     def _log(self, message: str):
         """Print verbose message."""
@@ -206,21 +555,22 @@ class MizuchiUploader:
     def _simple_upload(self, path: Path, destination: str, file_size: int) -> bool:
         """Perform a simple PUT upload for small files."""
         url = f"{self.endpoint}{destination}"
-        progress = UploadProgress(file_size)
-
         try:
             with open(path, 'rb') as f:
-                # Read entire file for simple upload (fine for files < multipart threshold)
-                data = f.read()
-
-            progress.add(file_size)
-            progress.display()
-
-            response = self.session.put(
-                url,
-                data=data,
-                headers={**self._get_headers(), 'Content-Length': str(file_size)},
-            )
+                # Hand the file handle straight to requests so the body is
+                # streamed without being slurped into memory first. The
+                # explicit Content-Length keeps it off chunked encoding.
+                # An empty file must not be a stream: requests would add
+                # Transfer-Encoding: chunked next to Content-Length: 0.
+                progress = UploadProgress(file_size, position=f.tell)
+                try:
+                    response = self.session.put(
+                        url,
+                        data=f if file_size else b'',
+                        headers={**self._base_headers, 'Content-Length': str(file_size)},
+                    )
+                finally:
+                    progress.close()
 
             print()  # New line after progress bar
 
@@ -240,56 +590,119 @@ class MizuchiUploader:
     def _multipart_upload(self, path: Path, destination: str, file_size: int) -> bool:
         """Perform multipart upload for large files with parallel chunk uploads."""
 
-        # Step 1: Initiate multipart upload
-        upload_id = self._initiate_multipart(destination)
-        if not upload_id:
-            return False
-
-        self._log(f"Multipart upload initiated: {upload_id}")
-
-        # Step 2: Calculate parts
+        completed_parts: List[Tuple[int, str]] = []
+        self._manifest = None
+        if self.resume:
+            # Key the manifest by target so uploads of one file to several
+            # destinations don't clobber each other's resume state
+            target = hashlib.sha256(f"{self.endpoint}{destination}".encode()).hexdigest()[:12]
+            self._manifest = _ResumeManifest(
+                path.with_name(f"{path.name}.{target}{MANIFEST_SUFFIX}"),
+                {
+                    'endpoint': self.endpoint,
+                    'destination': destination,
+                    'file_size': file_size,
+                    'mtime_ns': path.stat().st_mtime_ns,
+                    'chunk_size': self.chunk_size,
+                },
+            )
+            completed_parts = self._manifest.load()
+            if self._manifest.stale:
+                self._discard_stale_upload(*self._manifest.stale)
+
+        # Step 1: Initiate multipart upload, unless resuming one
+        resumed = bool(self._manifest and self._manifest.upload_id)
+        if resumed:
+            upload_id = self._manifest.upload_id
+            print(f"Resuming upload: {len(completed_parts)} parts already uploaded")
+            self._log(f"Resuming multipart upload: {upload_id}")
+        else:
+            upload_id = self._initiate_multipart(destination)
+            if not upload_id:
+                return False
+            self._log(f"Multipart upload initiated: {upload_id}")
+            if self._manifest:
+                self._manifest.upload_id = upload_id
+                try:
+                    self._manifest.save(completed_parts, force=True)
+                except OSError as e:
+                    print(f"Warning: Cannot write resume state, continuing without it: {e}")
+                    self._manifest = None
+
+        self._cancel.clear()
+        self._upload_missing.clear()
+
+        # Step 2: Calculate parts, skipping any a previous run completed
+        part_count = (file_size + self.chunk_size - 1) // self.chunk_size
         parts = self._calculate_parts(file_size)
-        print(f"Uploading in {len(parts)} parts ({format_size(self.chunk_size)} each)")
-        print(f"Parallel uploads: {self.parallel}")
+        if completed_parts:
+            done = {part_num for part_num, _ in completed_parts}
+            parts = (part for part in parts if part[0] not in done)
+        print(f"Uploading in {part_count} parts ({format_size(self.chunk_size)} each)")
+        # Small multiparts gain little from parallelism; upload them one by
+        # one over the session's warm connection without a thread pool
+        serial = self.parallel == 1 or file_size < 4 * self.chunk_size
+        print(f"Parallel uploads: {1 if serial else self.parallel}")
         print()
 
         progress = UploadProgress(file_size)
-        completed_parts: List[Tuple[int, str]] = []
-        parts_lock = Lock()
+        resumed_bytes = sum(
+            min(self.chunk_size, file_size - (part_num - 1) * self.chunk_size)
+            for part_num, _ in completed_parts
+        )
+        progress.add(resumed_bytes)
 
-        # Step 3: Upload parts in parallel
+        # Step 3: Upload parts from a single shared mapping
         try:
-            with ThreadPoolExecutor(max_workers=self.parallel) as executor:
-                futures = {}
-
-                for part_number, start, end in parts:
-                    future = executor.submit(
-                        self._upload_part,
-                        path, destination, upload_id, part_number, start, end, progress
-                    )
-                    futures[future] = part_number
-
-                for future in as_completed(futures):
-                    part_number = futures[future]
-                    try:
-                        etag = future.result()
-                        if etag:
-                            with parts_lock:
-                                completed_parts.append((part_number, etag))
-                        else:
-                            raise Exception(f"Part {part_number} upload failed")
-                    except Exception as e:
-                        print()
-                        print(f"✗ Part {part_number} failed: {e}")
-                        self._abort_multipart(destination, upload_id)
-                        return False
+            with open(path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                fd = f.fileno()
+                # The file is read once, front to back: ask for aggressive
+                # read-ahead here and drop each part's pages once it is sent.
+                # These are hints only, so failures are ignored.
+                try:
+                    if hasattr(mm, 'madvise'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    if hasattr(os, 'posix_fadvise'):
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError as e:
+                    self._log(f"Ignoring page cache hint failure: {e}")
+
+                upload_parts = self._upload_parts_serial if serial else self._upload_parts_parallel
+                failed_part = upload_parts(
+                    mm, fd, destination, upload_id, parts, progress, completed_parts
+                )
+
+            if failed_part is not None:
+                progress.close()
+                print()
+                if resumed and self._upload_missing.is_set():
+                    # The server expired or aborted the saved upload; the
+                    # manifest is useless, so start a fresh upload once
+                    print("Saved upload no longer exists on the server, starting over")
+                    self._manifest.delete()
+                    return self._multipart_upload(path, destination, file_size)
+                print(f"✗ Part {failed_part} upload failed")
+                self._abandon_multipart(destination, upload_id, completed_parts)
+                return False
 
         except KeyboardInterrupt:
+            progress.close()
             print()
-            print("Upload interrupted, aborting...")
-            self._abort_multipart(destination, upload_id)
+            print("Upload interrupted")
+            self._abandon_multipart(destination, upload_id, completed_parts)
+            return False
+
+        except Exception as e:
+            # e.g. the file can't be opened or mapped after the upload was
+            # initiated; don't leak the server-side multipart upload
+            progress.close()
+            print()
+            print(f"✗ Upload error: {e}")
+            self._abandon_multipart(destination, upload_id, completed_parts)
             return False
 
+        progress.close()
         print()  # New line after progress bar
 
         # Step 4: Complete multipart upload
@@ -297,45 +710,147 @@ class MizuchiUploader:
         success = self._complete_multipart(destination, upload_id, completed_parts)
 
         if success:
+            if self._manifest:
+                self._manifest.delete()
             elapsed = time.time() - progress.start_time
-            speed = file_size / elapsed if elapsed > 0 else 0
+            speed = (file_size - resumed_bytes) / elapsed if elapsed > 0 else 0
             print(f"✓ Upload successful!")
             print(f"  Time: {format_time(elapsed)}")
             print(f"  Average speed: {format_size(speed)}/s")
 
         return success
 
-    def _calculate_parts(self, file_size: int) -> List[Tuple[int, int, int]]:
-        """Calculate part boundaries for multipart upload."""
-        parts = []
-        part_number = 1
-        position = 0
+    def _upload_parts_serial(
+        self,
+        mm: mmap.mmap,
+        fd: int,
+        destination: str,
+        upload_id: str,
+        parts: Iterator[Tuple[int, int, int]],
+        progress: UploadProgress,
+        completed_parts: List[Tuple[int, str]],
+    ) -> Optional[int]:
+        """Upload parts one after another on the calling thread.
+
+        Returns the number of the failed part, or None if all succeeded.
+        """
+        for part_number, start, end in parts:
+            etag = self._upload_part(
+                mm, fd, destination, upload_id, part_number, start, end, progress
+            )
+            if not etag:
+                return part_number
+            completed_parts.append((part_number, etag))
+            self._checkpoint(completed_parts)
+        return None
 
-        while position < file_size:
-            start = position
-            end = min(position + self.chunk_size, file_size)
-            parts.append((part_number, start, end))
-            part_number += 1
-            position = end
+    def _upload_parts_parallel(
+        self,
+        mm: mmap.mmap,
+        fd: int,
+        destination: str,
+        upload_id: str,
+        parts: Iterator[Tuple[int, int, int]],
+        progress: UploadProgress,
+        completed_parts: List[Tuple[int, str]],
+    ) -> Optional[int]:
+        """Upload parts on a thread pool, keeping at most 2 * parallel in flight.
 
-        return parts
+        Returns the number of the first failed part, or None if all succeeded.
+        """
+        max_inflight = 2 * self.parallel
+        futures: Dict[Future, int] = {}
+        failed_part = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+                try:
+                    for part_number, start, end in parts:
+                        if len(futures) >= max_inflight:
+                            failed_part = self._collect_parts(futures, completed_parts)
+                            if failed_part is not None:
+                                break
+                        future = executor.submit(
+                            self._upload_part,
+                            mm, fd, destination, upload_id, part_number, start, end, progress
+                        )
+                        futures[future] = part_number
+
+                    while futures and failed_part is None:
+                        failed_part = self._collect_parts(futures, completed_parts)
+                finally:
+                    # Parts left over mean a failure or interrupt: don't spend
+                    # bandwidth on an upload that is about to be aborted
+                    if futures:
+                        self._cancel.set()
+                        for future in futures:
+                            future.cancel()
+        finally:
+            # Parts already sending when the loop stopped finish while the
+            # executor shuts down; keep their ETags for the resume manifest
+            for future, part_number in futures.items():
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    etag = future.result()
+                    if etag:
+                        completed_parts.append((part_number, etag))
+
+        return failed_part
+
+    def _collect_parts(
+        self,
+        futures: Dict[Future, int],
+        completed_parts: List[Tuple[int, str]],
+    ) -> Optional[int]:
+        """Wait for at least one part to finish and record its ETag.
+
+        Finished futures are removed from `futures`. Returns the number of
+        the first failed part, or None if every finished part succeeded.
+        """
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        failed_part = None
+        for future in done:
+            part_number = futures.pop(future)
+            try:
+                etag = future.result()
+            except Exception as e:
+                self._log(f"Part {part_number} error: {e}")
+                etag = None
+            if etag:
+                completed_parts.append((part_number, etag))
+            elif failed_part is None:
+                failed_part = part_number
+        self._checkpoint(completed_parts)
+        return failed_part
+
+    def _checkpoint(self, completed_parts: List[Tuple[int, str]]):
+        """Record completed parts in the resume manifest, if any (batched)."""
+        if self._manifest:
+            try:
+                self._manifest.save(completed_parts)
+            except OSError as e:
+                self._log(f"Failed to save resume state: {e}")
+
+    def _calculate_parts(self, file_size: int) -> Iterator[Tuple[int, int, int]]:
+        """Lazily yield (part_number, start, end) boundaries for multipart upload."""
+        chunk_size = self.chunk_size
+        part_count = (file_size + chunk_size - 1) // chunk_size
+        return (
+            (i + 1, i * chunk_size, min((i + 1) * chunk_size, file_size))
+            for i in range(part_count)
+        )
 
     def _initiate_multipart(self, destination: str) -> Optional[str]:
         """Initiate a multipart upload and return the upload ID."""
         url = f"{self.endpoint}{destination}?uploads"
 
         try:
-            response = self.session.post(url, headers=self._get_headers())
+            response = self.session.post(url, headers=self._base_headers)
 
             if response.status_code == 200:
-                # Parse XML response to get upload ID
-                root = ET.fromstring(response.text)
-                # Handle S3 namespace
-                ns = {'s3': 'http://s3.amazonaws.com/doc/2006-03-01/'}
-                upload_id_elem = root.find('.//UploadId') or root.find('.//s3:UploadId', ns)
-
-                if upload_id_elem is not None:
-                    return upload_id_elem.text
+                match = _UPLOAD_ID_RE.search(response.content)
+
+                if match:
+                    return match.group(1).decode()
                 else:
                     print(f"Error: Could not parse upload ID from response")
                     self._log(f"Response: {response.text}")
@@ -351,7 +866,8 @@ class MizuchiUploader:
 
     def _upload_part(
         self,
-        path: Path,
+        mm: mmap.mmap,
+        fd: int,
         destination: str,
         upload_id: str,
         part_number: int,
@@ -365,21 +881,40 @@ class MizuchiUploader:
 
         self._log(f"Uploading part {part_number}: bytes {start}-{end} ({format_size(part_size)})")
 
+        if self._cancel.is_set():
+            self._log(f"Part {part_number} skipped: upload cancelled")
+            return None
+
         try:
-            with open(path, 'rb') as f:
-                f.seek(start)
-                data = f.read(part_size)
+            headers = {
+                **self._base_headers,
+                'Content-Length': (
+                    self._chunk_content_length
+                    if part_size == self.chunk_size else str(part_size)
+                ),
+            }
+
+            # Hash straight from the mapping so the server can reject a
+            # corrupted part instead of failing the whole upload later
+            try:
+                with memoryview(mm)[start:end] as view:
+                    digest = hashlib.md5(view, usedforsecurity=False).digest()
+                headers['Content-MD5'] = base64.b64encode(digest).decode()
+            except (ValueError, TypeError):
+                # MD5 is unavailable (e.g. FIPS-mode OpenSSL) or, before
+                # Python 3.9, takes no usedforsecurity; send without it
+                pass
 
-            # Use requests.put directly instead of session for thread safety
-            # requests.Session is not guaranteed to be thread-safe
-            response = requests.put(
+            # The session is shared across workers; its pool is sized to
+            # `parallel` so each worker reuses a kept-alive connection
+            response = self.session.put(
                 url,
-                data=data,
-                headers={**self._get_headers(), 'Content-Length': str(part_size)},
+                data=_Slice(mm, start, end),
+                headers=headers,
             )
 
             progress.add(part_size)
-            progress.display()
+            self._release_range(mm, fd, start, end)
 
             if response.status_code == 200:
                 etag = response.headers.get('ETag', '').strip('"')
@@ -387,12 +922,29 @@ class MizuchiUploader:
                 return etag
             else:
                 self._log(f"Part {part_number} failed: {response.status_code} - {response.text[:200]}")
+                if response.status_code == 404:
+                    self._upload_missing.set()
                 return None
 
         except Exception as e:
             self._log(f"Part {part_number} error: {e}")
             return None
 
+    @staticmethod
+    def _release_range(mm: mmap.mmap, fd: int, start: int, end: int):
+        """Evict an uploaded byte range from the page cache (best effort)."""
+        try:
+            if hasattr(mm, 'madvise'):
+                # madvise needs a page-aligned start; round up so pages shared
+                # with the previous part are left alone
+                aligned = -(-start // mmap.PAGESIZE) * mmap.PAGESIZE
+                if aligned < end:
+                    mm.madvise(mmap.MADV_DONTNEED, aligned, end - aligned)
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
     def _complete_multipart(
         self,
         destination: str,
@@ -402,12 +954,16 @@ class MizuchiUploader:
         """Complete the multipart upload."""
         url = f"{self.endpoint}{destination}?uploadId={upload_id}"
 
-        # Build completion XML
-        xml_parts = ''.join(
-            f'<Part><PartNumber>{part_num}</PartNumber><ETag>"{etag}"</ETag></Part>'
-            for part_num, etag in parts
-        )
-        body = f'<?xml version="1.0" encoding="UTF-8"?><CompleteMultipartUpload>{xml_parts}</CompleteMultipartUpload>'
+        # Build the body as bytes in place: one fragment per part, no
+        # intermediate str list and no final encode pass
+        xml = bytearray(b'<?xml version="1.0" encoding="UTF-8"?><CompleteMultipartUpload>')
+        for part_num, etag in parts:
+            xml += b'<Part><PartNumber>%d</PartNumber><ETag>"%s"</ETag></Part>' % (
+                part_num, etag.encode()
+            )
+        xml += b'</CompleteMultipartUpload>'
+        # requests would treat a bytearray as an iterable stream; send bytes
+        body = bytes(xml)
 
         self._log(f"Completing multipart upload with {len(parts)} parts")
 
@@ -415,7 +971,7 @@ class MizuchiUploader:
             response = self.session.post(
                 url,
                 data=body,
-                headers={**self._get_headers(), 'Content-Type': 'application/xml'},
+                headers={**self._base_headers, 'Content-Type': 'application/xml'},
             )
 
             if response.status_code == 200:
@@ -429,12 +985,44 @@ class MizuchiUploader:
             print(f"Error: Failed to complete multipart upload: {e}")
             return False
 
+    def _abandon_multipart(
+        self,
+        destination: str,
+        upload_id: str,
+        completed_parts: List[Tuple[int, str]],
+    ):
+        """Give up on a failed upload: keep it for --resume, or abort it."""
+        if not self._manifest:
+            print("Aborting multipart upload...")
+            self._abort_multipart(destination, upload_id)
+            return
+
+        try:
+            self._manifest.save(completed_parts, force=True)
+        except OSError as e:
+            print(f"Error: Failed to save resume state: {e}")
+            self._abort_multipart(destination, upload_id)
+            return
+        print(f"  {len(completed_parts)} parts saved to {self._manifest.path}")
+        print("  Run again with --resume to continue, or delete it to start over")
+
+    def _discard_stale_upload(self, identity: dict, upload_id: str):
+        """Abort the upload of a manifest that no longer matches the file."""
+        destination = identity.get('destination')
+        if identity.get('endpoint') == self.endpoint and destination:
+            print(f"Discarding outdated resume state of upload to {destination}")
+            self._abort_multipart(destination, upload_id)
+        else:
+            # Don't send credentials to an endpoint read from a local file
+            print(f"Warning: Discarding resume state of upload {upload_id} "
+                  f"on {identity.get('endpoint')}; it was not aborted")
+
     def _abort_multipart(self, destination: str, upload_id: str):
         """Abort a multipart upload."""
         url = f"{self.endpoint}{destination}?uploadId={upload_id}"
 
         try:
-            response = self.session.delete(url, headers=self._get_headers())
+            response = self.session.delete(url, headers=self._base_headers)
             if response.status_code == 204:
                 self._log("Multipart upload aborted successfully")
             else:
@@ -462,6 +1050,10 @@ Examples:
   # Upload to custom endpoint
   %(prog)s upload file.txt /uploads/file.txt \\
       --endpoint http://my-server:8080
+
+  # Multiplex parts over HTTP/2
+  %(prog)s upload video.mp4 /private/video.mp4 \\
+      --endpoint https://my-server:8443 --http2
         """
     )
 
@@ -497,6 +1089,16 @@ Examples:
         default=DEFAULT_PARALLEL,
         help=f'Number of parallel uploads (default: {DEFAULT_PARALLEL})',
     )
+    upload_parser.add_argument(
+        '--http2',
+        action='store_true',
+        help='Multiplex uploads over HTTP/2, https:// only (requires httpx[http2])',
+    )
+    upload_parser.add_argument(
+        '--resume', '-r',
+        action='store_true',
+        help='Keep failed multipart uploads and resume them on the next run',
+    )
     upload_parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -524,6 +1126,8 @@ Examples:
             multipart_threshold=threshold,
             parallel=args.parallel,
             verbose=args.verbose,
+            http2=args.http2,
+            resume=args.resume,
         )
 
         success = uploader.upload(args.file, args.destination)